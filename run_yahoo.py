@@ -1,12 +1,14 @@
 # scm/yahoo_finance.py
-import itertools, pathlib, time, json
-from decimal import Decimal, InvalidOperation
-from typing import Dict, List, Any, Optional
+import os, pathlib, tempfile, threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from typing import Dict, List, Optional, Tuple
 import yfinance as yf
+import numpy as np
 import pandas as pd
-import time
 
 OUTDIR = pathlib.Path("data"); OUTDIR.mkdir(parents=True, exist_ok=True)
+CACHE_DIR = OUTDIR / ".cache"  # raw yfinance statements, one pickle per symbol per day
 
 # Keep this narrow and consistent with your FMP set where possible
 SYMBOL_MAP: Dict[str, str] = {
@@ -23,17 +25,18 @@ SYMBOL_MAP: Dict[str, str] = {
     "Scientech": "3583.TW",
 }
 
+MAX_WORKERS = 8  # concurrent tickers; each one is ~6 blocking HTTP calls
+MAX_IN_FLIGHT = 8  # cap on simultaneous Yahoo requests across all tickers (429s come back as empty frames)
+_REQUEST_SLOTS = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+
+# Ticker attributes in the order fetch_yahoo_financials unpacks them (one HTTP call each)
+STATEMENTS = ("financials", "balance_sheet", "cashflow",
+              "quarterly_financials", "quarterly_balance_sheet", "quarterly_cashflow")
 
-def _to_dec_safe(x):
-    try:
-        if x in (None, "", "None"): return None
-        return Decimal(str(x))
-    except (InvalidOperation, ValueError):
-        return None
 
-def _fmt(x, nd=4): return None if x is None else float(round(x, nd))
-def _pct(x): return None if x is None else x * Decimal(100)
-def _div(a, b): return None if (a is None or b in (None, 0)) else a / b
+# Column-wise helpers; missing values stay NaN until serialization
+def _pct(x): return x * 100.0
+def _div(a, b): return a / b.where(b != 0)  # x/0 → NaN, not inf
 
 # Yahoo field aliases (varies by ticker)
 INC_FIELDS = {
@@ -63,219 +66,283 @@ CF_FIELDS = {
 
 
 
-def get_first(df: pd.DataFrame, name_list: List[str]) -> Optional[pd.Series]:
-    for n in name_list:
-        if n in df.index:
-            return df.loc[n]
-    return None
+# Reverse lookups: Yahoo row label → (metric key, alias priority)
+def _reverse_aliases(fields: Dict[str, List[str]]) -> Dict[str, Tuple[str, int]]:
+    return {alias: (key, rank) for key, aliases in fields.items() for rank, alias in enumerate(aliases)}
+
+INC_ALIASES = _reverse_aliases(INC_FIELDS)
+BAL_ALIASES = _reverse_aliases(BAL_FIELDS)
+CF_ALIASES  = _reverse_aliases(CF_FIELDS)
+RAW_COLUMNS = [*INC_FIELDS, *BAL_FIELDS, *CF_FIELDS]
+
+def get_fields(df: pd.DataFrame, reverse: Dict[str, Tuple[str, int]]) -> Dict[str, pd.Series]:
+    # One pass over the statement's row labels; when several aliases of a
+    # metric are present, the one listed first in *_FIELDS wins
+    best: Dict[str, Tuple[int, str]] = {}
+    for name in df.index:
+        hit = reverse.get(name)
+        if hit is not None and (hit[0] not in best or hit[1] < best[hit[0]][0]):
+            best[hit[0]] = (hit[1], name)
+    return {key: df.loc[name] for key, (_, name) in best.items()}
 
 def build_rows_from_dfs(company: str, symbol: str,
                          inc_df: pd.DataFrame, bal_df: pd.DataFrame, cf_df: pd.DataFrame,
-                         freq_label: str) -> List[Dict[str, Any]]:
+                         freq_label: str) -> pd.DataFrame:
 
     # Extract series for each metric (series indexed by columns=dates)
-    rev_s = get_first(inc_df, INC_FIELDS["revenue"])
-    gp_s  = get_first(inc_df, INC_FIELDS["grossProfit"])
-    ni_s  = get_first(inc_df, INC_FIELDS["netIncome"])
-    rd_s  = get_first(inc_df, INC_FIELDS["rd"])
-
-    cash_s   = get_first(bal_df, BAL_FIELDS["cash"])
-    sdebt_s  = get_first(bal_df, BAL_FIELDS["shortDebt"])
-    ldebt_s  = get_first(bal_df, BAL_FIELDS["longDebt"])
-    tliab_s  = get_first(bal_df, BAL_FIELDS["totalLiab"])
-    equity_s = get_first(bal_df, BAL_FIELDS["equity"])
-    ca_s     = get_first(bal_df, BAL_FIELDS["currAssets"])
-    cl_s     = get_first(bal_df, BAL_FIELDS["currLiab"])
-
-    ocf_s   = get_first(cf_df, CF_FIELDS["opCF"])
-    capex_s = get_first(cf_df, CF_FIELDS["capex"])
-
-    # Gather all date columns present & order them
-    def cols(s: Optional[pd.Series]) -> List[pd.Timestamp]:
-        return list(s.index) if s is not None else []
-    dates = sorted(set(itertools.chain(
-        cols(rev_s), cols(gp_s), cols(ni_s), cols(rd_s),
-        cols(cash_s), cols(sdebt_s), cols(ldebt_s), cols(tliab_s),
-        cols(equity_s), cols(ca_s), cols(cl_s),
-        cols(ocf_s), cols(capex_s)
-    )), reverse=True)
-
-    out: List[Dict[str, Any]] = []
-    for d in dates:
-        # Values can be NaN → drop to None early
-        def val(s: Optional[pd.Series]):
-            if s is None: return None
-            v = s.get(d, None)
-            if pd.isna(v): return None
-            return _to_dec_safe(v)
-
-        totalRevenue = val(rev_s)
-        grossProfit  = val(gp_s)
-        netIncome    = val(ni_s)
-        rd_expense   = val(rd_s)
-
-        cash       = val(cash_s)
-        shortDebt  = val(sdebt_s)
-        longDebt   = val(ldebt_s)
-        totalLiab  = val(tliab_s)
-        equity     = val(equity_s)
-        currAssets = val(ca_s)
-        currLiab   = val(cl_s)
-
-        opCF  = val(ocf_s)
-        capex = val(capex_s)
-        fcf   = (opCF - capex) if None not in (opCF, capex) else None
-
-        totalDebt = None
-        if shortDebt is not None or longDebt is not None:
-            totalDebt = (shortDebt or Decimal(0)) + (longDebt or Decimal(0))
-
-        ds = str(d.date()) if hasattr(d, "date") else str(d)  # ISO date
-        row = {
-            "company": company,
-            "symbol": symbol,
-            "freq": freq_label,
-            "fiscalDate": ds,
-            "metrics": {
-                "fiscalDate": ds,
-                "totalRevenue": _fmt(totalRevenue, 2),
-                "grossProfit": _fmt(grossProfit, 2),
-                "netIncome": _fmt(netIncome, 2),
-                "grossMargin_pct": _fmt(_pct(_div(grossProfit, totalRevenue)), 2),
-                "netMargin_pct": _fmt(_pct(_div(netIncome, totalRevenue)), 2),
-                "operatingCashflow": _fmt(opCF, 2),
-                "capitalExpenditures": _fmt(capex, 2),
-                "freeCashFlow": _fmt(fcf, 2),
-                "cashAndCashEquivalents": _fmt(cash, 2),
-                "shortTermDebt": _fmt(shortDebt, 2),
-                "longTermDebt": _fmt(longDebt, 2),
-                "totalDebt": _fmt(totalDebt, 2) if totalDebt is not None else None,
-                "totalLiabilities": _fmt(totalLiab, 2),
-                "totalShareholderEquity": _fmt(equity, 2),
-                "totalCurrentAssets": _fmt(currAssets, 2),
-                "totalCurrentLiabilities": _fmt(currLiab, 2),
-                "debtToEquity": _fmt(_div(totalLiab, equity), 4),
-                "currentRatio": _fmt(_div(currAssets, currLiab), 4),
-                "cashRatio": _fmt(_div(cash, currLiab), 4),
-                "researchAndDevelopment": _fmt(rd_expense, 2),
-                "rdIntensity_pct": _fmt(_pct(_div(rd_expense, totalRevenue)), 2),
-                "capexToRevenue_pct": _fmt(_pct(_div(capex, totalRevenue)), 2),
-            },
-            "summary": f"{company} {freq_label} {ds}: Rev={_fmt(totalRevenue,2)}, NI={_fmt(netIncome,2)}, GM%={_fmt(_pct(_div(grossProfit,totalRevenue)),2)}, NM%={_fmt(_pct(_div(netIncome,totalRevenue)),2)}",
-            "source": "YahooFinance"
-        }
-        # quick flags
-        m = row["metrics"]
-        flags = []
-        if (m.get("currentRatio") is not None) and (m["currentRatio"] < 1): flags.append("current_ratio_lt_1") #potential liquidity issues for company
-        if (m.get("freeCashFlow") is not None) and (m["freeCashFlow"] < 0): flags.append("negative_fcf") #no cash left over after its operating expenses & capital expenditures 
-        if (m.get("debtToEquity") is not None) and (m["debtToEquity"] > 2): flags.append("high_debt_to_equity") #heavily reliabnt on borrowed funds to finance operations
-        m["distressFlags"] = flags
-        out.append(row)
-
-    # QoQ / YoY on sorted list
-    by_date = {r["fiscalDate"]: r for r in out}
-    for i, row in enumerate(out):
-        m = row["metrics"]
-        if i + 1 < len(out):
-            prev_m = out[i + 1]["metrics"]
-            for k in ("totalRevenue", "netIncome"):
-                cv, pv = m.get(k), prev_m.get(k)
-                if all(isinstance(v, (int, float)) for v in (cv, pv)) and pv:
-                    m[f"{k}_QoQ_growth_pct"] = round((cv - pv) / pv * 100, 2)
-        try:
-            mmdd = row["fiscalDate"][5:]
-            prev_y = by_date.get(str(int(row["fiscalDate"][:4]) - 1) + "-" + mmdd)
-            if prev_y:
-                prev_m = prev_y["metrics"]
-                for k in ("totalRevenue", "netIncome"):
-                    cv, pv = m.get(k), prev_m.get(k)
-                    if all(isinstance(v, (int, float)) for v in (cv, pv)) and pv:
-                        m[f"{k}_YoY_growth_pct"] = round((cv - pv) / pv * 100, 2)
-        except: 
-            pass
-
-    return out
-
-def fetch_yahoo_financials(company: str, symbol: str) -> List[Dict[str, Any]]:
+    present = {**get_fields(inc_df, INC_ALIASES),
+               **get_fields(bal_df, BAL_ALIASES),
+               **get_fields(cf_df, CF_ALIASES)}
+    if not present:
+        return pd.DataFrame()
+
+    # Stack the raw series into one frame: rows = dates (newest first), cols = metrics
+    # The outer join takes the union of every series' dates in one Index op
+    raw = pd.concat(present, axis=1, sort=True)
+    if raw.empty:
+        return pd.DataFrame()
+    # DatetimeIndex so YoY can align on a calendar shift and dates format in one call
+    raw.index = pd.to_datetime(raw.index)
+    raw = raw.sort_index(ascending=False)
+    raw = raw.reindex(columns=RAW_COLUMNS).apply(pd.to_numeric, errors="coerce")
+
+    rev, capex = raw["revenue"], raw["capex"]
+    fcf = raw["opCF"] - capex
+    totalDebt = raw[["shortDebt", "longDebt"]].sum(axis=1, min_count=1)  # NaN only if both are missing
+
+    metrics_df = pd.DataFrame({
+        "totalRevenue": rev.round(2),
+        "grossProfit": raw["grossProfit"].round(2),
+        "netIncome": raw["netIncome"].round(2),
+        "grossMargin_pct": _pct(_div(raw["grossProfit"], rev)).round(2),
+        "netMargin_pct": _pct(_div(raw["netIncome"], rev)).round(2),
+        "operatingCashflow": raw["opCF"].round(2),
+        "capitalExpenditures": capex.round(2),
+        "freeCashFlow": fcf.round(2),
+        "cashAndCashEquivalents": raw["cash"].round(2),
+        "shortTermDebt": raw["shortDebt"].round(2),
+        "longTermDebt": raw["longDebt"].round(2),
+        "totalDebt": totalDebt.round(2),
+        "totalLiabilities": raw["totalLiab"].round(2),
+        "totalShareholderEquity": raw["equity"].round(2),
+        "totalCurrentAssets": raw["currAssets"].round(2),
+        "totalCurrentLiabilities": raw["currLiab"].round(2),
+        "debtToEquity": _div(raw["totalLiab"], raw["equity"]).round(4),
+        "currentRatio": _div(raw["currAssets"], raw["currLiab"]).round(4),
+        "cashRatio": _div(raw["cash"], raw["currLiab"]).round(4),
+        "researchAndDevelopment": raw["rd"].round(2),
+        "rdIntensity_pct": _pct(_div(raw["rd"], rev)).round(2),
+        "capexToRevenue_pct": _pct(_div(capex, rev)).round(2),
+    })
+    # QoQ vs. the previous reported period, YoY vs. the same fiscal date a year earlier
+    base = metrics_df[["totalRevenue", "netIncome"]].sort_index()
+    growth_df = pd.concat([
+        base.pct_change(fill_method=None).add_suffix("_QoQ_growth_pct"),
+        base.pct_change(fill_method=None, freq=pd.DateOffset(years=1)).add_suffix("_YoY_growth_pct"),
+    ], axis=1).replace([np.inf, -np.inf], np.nan).mul(100).round(2)
+
+    fiscal_dates = metrics_df.index.strftime("%Y-%m-%d")  # ISO dates
+
+    # quick flags as boolean columns (NaN compares False, so missing ratios never flag);
+    # nest_records collapses them into the distressFlags label list
+    flags_df = pd.DataFrame({
+        "current_ratio_lt_1": metrics_df["currentRatio"] < 1, #potential liquidity issues for company
+        "negative_fcf": metrics_df["freeCashFlow"] < 0, #no cash left over after its operating expenses & capital expenditures
+        "high_debt_to_equity": metrics_df["debtToEquity"] > 2, #heavily reliabnt on borrowed funds to finance operations
+    })
+
+    # One row per fiscal date, columns in JSONL order; nesting happens at write time
+    rows_df = metrics_df.join(flags_df).join(growth_df)
+    rows_df.insert(0, "fiscalDate", fiscal_dates)
+    rows_df.insert(0, "freq", freq_label)
+    rows_df.insert(0, "symbol", symbol)
+    rows_df.insert(0, "company", company)
+    rows_df["source"] = "YahooFinance"
+    return rows_df.reset_index(drop=True)
+
+def _read_cache(path: pathlib.Path) -> Dict[str, pd.DataFrame]:
+    if not path.exists():
+        return {}
+    try:
+        statements = pd.read_pickle(path)
+        if isinstance(statements, dict):
+            return statements
+    except Exception:
+        pass  # truncated / corrupt pickle (interrupted or concurrent run)
+    path.unlink(missing_ok=True)
+    return {}
+
+def _write_cache(path: pathlib.Path, statements: Dict[str, pd.DataFrame]):
+    # Write to a temp file in the same dir, then atomically swap it into place
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pd.to_pickle(statements, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def _fetch_statement(t: yf.Ticker, name: str) -> pd.DataFrame:
+    with _REQUEST_SLOTS:
+        return getattr(t, name)
+
+def load_statements(symbol: str, t: yf.Ticker) -> Dict[str, pd.DataFrame]:
+    # Same-day re-runs read the pickled statements instead of hitting Yahoo.
+    # Only non-empty statements are cached: yfinance logs a failed / rate-limited
+    # call and returns an empty frame, so empty ones are refetched on every run.
+    cache_path = CACHE_DIR / f"{symbol}_{date.today():%Y%m%d}.pkl"
+    statements = _read_cache(cache_path)
+    missing = [name for name in STATEMENTS if name not in statements]
+    if not missing:
+        return statements
+
+    # Annual + quarterly statements, fetched concurrently (each is its own request)
+    with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+        fetched = dict(zip(missing, pool.map(lambda name: _fetch_statement(t, name), missing)))
+    statements.update(fetched)
+
+    if any(not df.empty for df in fetched.values()):
+        _write_cache(cache_path, {name: df for name, df in statements.items() if not df.empty})
+        for old in CACHE_DIR.glob(f"{symbol}_*.pkl"):
+            if old != cache_path:
+                old.unlink(missing_ok=True)
+    return statements
+
+def fetch_yahoo_financials(company: str, symbol: str,
+                           ticker: Optional[yf.Ticker] = None) -> Dict[str, pd.DataFrame]:
     if not symbol:
         print(f"[warn] No symbol for {company}")
-        return []
-    t = yf.Ticker(symbol)
+        return {}
+    t = ticker if ticker is not None else yf.Ticker(symbol)
+    return load_statements(symbol, t)
 
-    # Annual data
-    inc_a = t.financials
-    bal_a = t.balance_sheet
-    cf_a  = t.cashflow
-
-    # Quarterly data
-    inc_q = t.quarterly_financials
-    bal_q = t.quarterly_balance_sheet
-    cf_q  = t.quarterly_cashflow
+def build_ticker_rows(company: str, symbol: str, statements: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    if not statements:
+        return pd.DataFrame()
+    inc_a, bal_a, cf_a, inc_q, bal_q, cf_q = (statements[name] for name in STATEMENTS)
 
     #yfinance dataframes : row = account, col=period(Timestamp)
-    records: List[Dict[str,Any]] = []
-    records += build_rows_from_dfs(company, symbol, inc_q, bal_q, cf_q, "Quarter")
-    records += build_rows_from_dfs(company, symbol, inc_a, bal_a, cf_a, "Annual")
-    return records
+    return concat_rows([
+        build_rows_from_dfs(company, symbol, inc_q, bal_q, cf_q, "Quarter"),
+        build_rows_from_dfs(company, symbol, inc_a, bal_a, cf_a, "Annual"),
+    ])
+
+def concat_rows(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    frames = [df for df in frames if not df.empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+# Top-level JSONL fields; the remaining row columns nest under "metrics"
+RECORD_FIELDS = ["company", "symbol", "freq", "fiscalDate", "source"]
+GROWTH_COLUMNS = [f"{k}_{p}_growth_pct" for p in ("QoQ", "YoY") for k in ("totalRevenue", "netIncome")]
+DISTRESS_FLAGS = ["current_ratio_lt_1", "negative_fcf", "high_debt_to_equity"]
+
+# Flat CSV column → rows column
+CSV_COLUMNS = {
+    "symbol": "symbol",
+    "frequency": "freq",
+    "fiscalDate": "fiscalDate",
+    "revenue": "totalRevenue",
+    "grossProfit": "grossProfit",
+    "netIncome": "netIncome",
+    "grossMargin_pct": "grossMargin_pct",
+    "netMargin_pct": "netMargin_pct",
+    "revenue_QoQ_growth_pct": "totalRevenue_QoQ_growth_pct",
+    "revenue_YoY_growth_pct": "totalRevenue_YoY_growth_pct",
+    "netIncome_QoQ_growth_pct": "netIncome_QoQ_growth_pct",
+    "netIncome_YoY_growth_pct": "netIncome_YoY_growth_pct",
+    "operatingCashflow": "operatingCashflow",
+    "freeCashFlow": "freeCashFlow",
+    "debtToEquity": "debtToEquity",
+    "currentRatio": "currentRatio",
+    "cashRatio": "cashRatio",
+    "researchAndDevelopment": "researchAndDevelopment",
+    "rdIntensity_pct": "rdIntensity_pct",
+    "capexToRevenue_pct": "capexToRevenue_pct",
+    "source": "source",
+}
 
-def write_outputs(records: List[Dict[str, Any]]):
+# Per-row dicts are only materialized here, for the nested JSONL layout
+def nest_records(rows_df: pd.DataFrame) -> pd.DataFrame:
+    if rows_df.empty:
+        return pd.DataFrame(columns=["company", "symbol", "freq", "fiscalDate", "metrics", "summary", "source"])
+    metric_cols = ["fiscalDate"] + [c for c in rows_df.columns
+                                    if c not in RECORD_FIELDS + DISTRESS_FLAGS + GROWTH_COLUMNS]
+    values = rows_df[metric_cols + GROWTH_COLUMNS]
+    values = values.astype(object).where(values.notna(), None)  # NaN → None for JSON
+    flag_hits = rows_df[DISTRESS_FLAGS].to_numpy()
+
+    n_metrics = len(metric_cols)
+    metrics, summaries = [], []
+    for company, freq, row, hits in zip(rows_df["company"], rows_df["freq"],
+                                        values.itertuples(index=False, name=None), flag_hits):
+        m = dict(zip(metric_cols, row[:n_metrics]))
+        m["distressFlags"] = [flag for flag, hit in zip(DISTRESS_FLAGS, hits) if hit]
+        # growth keys only where there is a comparable prior period
+        m.update((k, v) for k, v in zip(GROWTH_COLUMNS, row[n_metrics:]) if v is not None)
+        metrics.append(m)
+        # reuse the already rounded/None-mapped values instead of recomputing the margins
+        summaries.append(f"{company} {freq} {m['fiscalDate']}: Rev={m['totalRevenue']}, NI={m['netIncome']}, "
+                         f"GM%={m['grossMargin_pct']}, NM%={m['netMargin_pct']}")
+    return rows_df[["company", "symbol", "freq", "fiscalDate"]].assign(
+        metrics=metrics, summary=summaries, source=rows_df["source"])
+
+def write_outputs(rows_df: pd.DataFrame):
     
     jsonl_path = OUTDIR / "yahoo_finance.jsonl"
-    with open(jsonl_path, "w", encoding="utf-8") as f:
-        for rec in records:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    # Nested metrics/flags serialize as-is; one pass through pandas' C JSON writer
+    # (every metric is rounded to <= 4 dp, so double_precision=4 is lossless)
+    nest_records(rows_df).to_json(jsonl_path, orient="records", lines=True,
+                                  force_ascii=False, double_precision=4)
 
     
-    flat_rows = []
-    for rec in records:
-        m = rec["metrics"]
-        flat_rows.append({
-            "symbol": rec["symbol"],
-            "frequency": rec["freq"],
-            "fiscalDate": rec["fiscalDate"],
-            "revenue": m.get("totalRevenue"),
-            "grossProfit": m.get("grossProfit"),
-            "netIncome": m.get("netIncome"),
-            "grossMargin_pct": m.get("grossMargin_pct"),
-            "netMargin_pct": m.get("netMargin_pct"),
-            "revenue_QoQ_growth_pct": m.get("totalRevenue_QoQ_growth_pct"),
-            "revenue_YoY_growth_pct": m.get("totalRevenue_YoY_growth_pct"),
-            "netIncome_QoQ_growth_pct": m.get("netIncome_QoQ_growth_pct"),
-            "netIncome_YoY_growth_pct": m.get("netIncome_YoY_growth_pct"),
-            "operatingCashflow": m.get("operatingCashflow"),
-            "freeCashFlow": m.get("freeCashFlow"),
-            "debtToEquity": m.get("debtToEquity"),
-            "currentRatio": m.get("currentRatio"),
-            "cashRatio": m.get("cashRatio"),
-            "researchAndDevelopment": m.get("researchAndDevelopment"),
-            "rdIntensity_pct": m.get("rdIntensity_pct"),
-            "capexToRevenue_pct": m.get("capexToRevenue_pct"),
-            "source": "YahooFinance"
-        })
-    df = pd.DataFrame(flat_rows)
-    if not df.empty:
-        df.sort_values(["symbol", "frequency", "fiscalDate"], ascending=[True, True, False], inplace=True)
+    # Always has the CSV columns (even with no rows), so sort + write can be one chain
     csv_path = OUTDIR / "yahoo_finance.csv"
-    df.to_csv(csv_path, index=False)
+    (rows_df
+       .reindex(columns=list(CSV_COLUMNS.values()))
+       .set_axis(list(CSV_COLUMNS), axis=1)
+       .sort_values(["symbol", "frequency", "fiscalDate"], ascending=[True, True, False])
+       .to_csv(csv_path, index=False))
 
     print("Wrote:")
     print("-", jsonl_path)
     print("-", csv_path)
 
 def main():
-    all_records = []
+    # One multi-symbol handle up front; yfinance shares a single keep-alive session
+    # (cookie + crumb) across all of its Ticker objects and threads
+    tickers = yf.Tickers(" ".join(s for s in SYMBOL_MAP.values() if s)).tickers
+
+    # Fetch phase (network-bound): threads
+    fetched: Dict[Tuple[str, str], Dict[str, pd.DataFrame]] = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {pool.submit(fetch_yahoo_financials, company, symbol, tickers.get(symbol)): (company, symbol)
+                   for company, symbol in SYMBOL_MAP.items()}
+        for fut in as_completed(futures):
+            company, symbol = futures[fut]
+            print(f"[Yahoo] {company} → {symbol}")
+            try:
+                fetched[(company, symbol)] = fut.result()
+            except Exception as e:
+                print(f"[warn] {company} ({symbol}) failed: {type(e).__name__}: {e}")
+
+    # Build phase (CPU): a few ms of pandas per ticker, so it runs in-process;
+    # a process pool would spend longer starting workers and pickling frames.
+    # Iterating SYMBOL_MAP keeps its order in the outputs.
+    frames = []
     for company, symbol in SYMBOL_MAP.items():
-        print(f"[Yahoo] {company} → {symbol}")
+        if (company, symbol) not in fetched:
+            continue
         try:
-            recs = fetch_yahoo_financials(company, symbol)
-            if not recs:
-                print(f"[info] No financials returned for {company} ({symbol})")
-            all_records.extend(recs)
+            rows_df = build_ticker_rows(company, symbol, fetched[(company, symbol)])
         except Exception as e:
             print(f"[warn] {company} ({symbol}) failed: {type(e).__name__}: {e}")
-        time.sleep(0.3)  # be gentle
-    write_outputs(all_records)
+            continue
+        if rows_df.empty:
+            print(f"[info] No financials returned for {company} ({symbol})")
+        frames.append(rows_df)
+    write_outputs(concat_rows(frames))
 
 if __name__ == "__main__":
     main()